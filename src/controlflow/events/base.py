@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Optional
 
 from pydantic import ConfigDict, Field
 from pydantic_extra_types.pendulum_dt import DateTime
+from typing_extensions import Self
 
 from controlflow.utilities.general import ControlFlowModel
 
@@ -34,5 +35,22 @@ class Event(ControlFlowModel):
 
 
 class UnpersistedEvent(Event):
-    model_config: ConfigDict = ConfigDict(arbitrary_types_allowed=True)
+    # unpersisted events are created internally (often once per streamed
+    # chunk) and only passed to handlers, so assignments aren't revalidated
+    model_config: ConfigDict = ConfigDict(
+        arbitrary_types_allowed=True, validate_assignment=False
+    )
     persist: bool = False
+
+    @classmethod
+    def _fast(cls, **kwargs) -> Self:
+        """
+        Create an event from trusted, already-validated data without running
+        validation. Defaults are still applied.
+
+        Warning: nothing is checked. Misspelled or unknown fields are silently
+        dropped, and missing required fields only fail when they are accessed, so
+        this should only be used internally on hot paths where every field is
+        passed explicitly.
+        """
+        return cls.model_construct(**kwargs)
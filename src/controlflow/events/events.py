@@ -1,7 +1,9 @@
-from typing import TYPE_CHECKING, Literal, Optional, Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 
 import pydantic_core
 from pydantic import ConfigDict, field_validator, model_validator
+from typing_extensions import Self
 
 from controlflow.agents.agent import Agent
 from controlflow.events.base import Event, UnpersistedEvent
@@ -22,6 +24,30 @@ logger = get_logger(__name__)
 
 ORCHESTRATOR_PREFIX = "The following message is from the orchestrator."
 
+# message types whose fields are plain python data, so a shallow copy of the
+# field values is equivalent to (and much cheaper than) a full `model_dump()`
+TRUSTED_MESSAGE_TYPES = (AIMessage, AIMessageChunk)
+
+
+def message_to_dict(message: BaseMessage) -> dict:
+    """
+    Convert a LangChain message to a dict of its field values.
+
+    Messages produced by the LLM are already well-typed, so for the trusted
+    message types this copies the field values (and any extra fields) instead of
+    performing a recursive `model_dump()`. Subclasses may define custom
+    serialization, so they still go through `model_dump()`.
+    """
+    if type(message) in TRUSTED_MESSAGE_TYPES:
+        return message.__dict__ | (message.__pydantic_extra__ or {})
+    return message.model_dump()
+
+
+def format_orchestrator_content(
+    prefix: Optional[str], content: Union[str, list[Union[str, dict]]]
+) -> str:
+    return f"({prefix})\n\n{content}"
+
 
 class OrchestratorMessage(Event):
     """
@@ -33,14 +59,34 @@ class OrchestratorMessage(Event):
     prefix: Optional[str] = ORCHESTRATOR_PREFIX
     name: Optional[str] = None
 
+    @model_validator(mode="after")
+    def _finalize(self):
+        # clear the cached content in case the prefix or content was reassigned
+        self.__dict__.pop("formatted_content", None)
+        return self
+
+    def model_copy(
+        self, *, update: Optional[dict[str, Any]] = None, deep: bool = False
+    ) -> Self:
+        copy = super().model_copy(update=update, deep=deep)
+        # the cached content was copied along with the fields; drop it in case the
+        # update changed them
+        copy.__dict__.pop("formatted_content", None)
+        return copy
+
+    @cached_property
+    def formatted_content(self) -> str:
+        """
+        The content with its prefix. This is cached, and only refreshed when the
+        prefix or content is reassigned, so in-place edits to the content are not
+        reflected.
+        """
+        return format_orchestrator_content(self.prefix, self.content)
+
     def to_messages(self, context: "CompileContext") -> list[BaseMessage]:
-        messages = []
-        # if self.prefix:
-        #     messages.append(SystemMessage(content=self.prefix))
-        messages.append(
-            HumanMessage(content=f"({self.prefix})\n\n{self.content}", name=self.name)
-        )
-        return messages
+        return [
+            HumanMessage.model_construct(content=self.formatted_content, name=self.name)
+        ]
 
 
 class UserMessage(Event):
@@ -59,25 +105,59 @@ class AgentMessage(Event):
     @field_validator("message", mode="before")
     def _as_message_dict(cls, v):
         if isinstance(v, BaseMessage):
-            v = v.model_dump()
+            v = message_to_dict(v)
         v["type"] = "ai"
         return v
 
     @model_validator(mode="after")
     def _finalize(self):
         self.message["name"] = self.agent.name
+        # clear cached values in case the agent or message was reassigned
+        self.__dict__.pop("ai_message", None)
+        self.__dict__.pop("cross_agent_content", None)
         return self
 
-    @property
+    def model_copy(
+        self, *, update: Optional[dict[str, Any]] = None, deep: bool = False
+    ) -> Self:
+        copy = super().model_copy(update=update, deep=deep)
+        # the cached values were copied along with the fields; drop them in case
+        # the update changed them
+        copy.__dict__.pop("ai_message", None)
+        copy.__dict__.pop("cross_agent_content", None)
+        return copy
+
+    @cached_property
     def ai_message(self) -> AIMessage:
-        return AIMessage(**self.message)
+        """
+        The message as an AIMessage. This is cached, and only refreshed when the
+        agent or message is reassigned, so in-place edits to the message dict are
+        not reflected.
+        """
+        # the message dict was produced from a validated message, so it is
+        # safe to skip validation
+        return AIMessage.model_construct(**self.message)
+
+    @cached_property
+    def cross_agent_content(self) -> str:
+        """
+        The message content as presented to agents other than the author. Like
+        `ai_message`, this is only refreshed when the agent or message is
+        reassigned.
+        """
+        return format_orchestrator_content(
+            prefix=f'The following message was posted by Agent "{self.agent.name}" with ID {self.agent.id}',
+            content=self.message["content"],
+        )
 
     def to_tool_calls(self, tools: list[Tool]) -> list["AgentToolCall"]:
         calls = []
+        # built in reverse so that the first tool with a given name wins
+        tools_by_name = {t.name: t for t in reversed(tools)}
         for tool_call in (
             self.message["tool_calls"] + self.message["invalid_tool_calls"]
         ):
-            tool = next((t for t in tools if t.name == tool_call.get("name")), None)
+            tool = tools_by_name.get(tool_call.get("name"))
             if tool:
                 calls.append(
                     AgentToolCall(
@@ -92,25 +172,30 @@ class AgentMessage(Event):
 
     def to_content(self) -> Optional["AgentContent"]:
         if self.message.get("content"):
-            return AgentContent(
+            return AgentContent._fast(
                 agent=self.agent,
                 content=self.message["content"],
                 agent_message_id=self.message.get("id"),
             )
 
     def all_related_events(self, tools: list[Tool]) -> list[Event]:
-        content = self.to_content()
-        return [self] + ([content] if content else []) + self.to_tool_calls(tools)
+        events: list[Event] = [self]
+        if content := self.to_content():
+            events.append(content)
+        events.extend(self.to_tool_calls(tools))
+        return events
 
     def to_messages(self, context: "CompileContext") -> list[BaseMessage]:
         if self.agent.name == context.agent.name:
-            return [self.ai_message]
+            # the compiler may modify messages in place, so don't hand out the
+            # cached message itself
+            return [self.ai_message.model_copy()]
         elif self.message["content"]:
-            return OrchestratorMessage(
-                prefix=f'The following message was posted by Agent "{self.agent.name}" with ID {self.agent.id}',
-                content=self.message["content"],
-                name=self.agent.name,
-            ).to_messages(context)
+            return [
+                HumanMessage.model_construct(
+                    content=self.cross_agent_content, name=self.agent.name
+                )
+            ]
         else:
             return []
 
@@ -122,12 +207,22 @@ class AgentMessageDelta(UnpersistedEvent):
     message_delta: dict
     message_snapshot: dict
 
-    @field_validator("message_delta", "message_snapshot", mode="before")
-    def _as_message_dict(cls, v):
-        if isinstance(v, BaseMessage):
-            v = v.model_dump()
-        v["type"] = "AIMessageChunk"
-        return v
+    @model_validator(mode="before")
+    @classmethod
+    def _prep(cls, data):
+        """
+        Converts the delta and snapshot to message dicts in a single pass.
+        """
+        if not isinstance(data, dict):
+            return data
+        data = data.copy()
+        for key in ("message_delta", "message_snapshot"):
+            v = data.get(key)
+            if isinstance(v, BaseMessage):
+                v = data[key] = message_to_dict(v)
+            if isinstance(v, dict):
+                v["type"] = "AIMessageChunk"
+        return data
 
     @model_validator(mode="after")
     def _finalize(self):
@@ -136,40 +231,41 @@ class AgentMessageDelta(UnpersistedEvent):
         return self
 
     def to_tool_call_deltas(self, tools: list[Tool]) -> list["AgentToolCallDelta"]:
-        deltas = []
-        for call_delta in self.message_delta.get("tool_call_chunks", []):
-            # First match chunks by index because streaming chunks come in sequence (0,1,2...)
-            # and this index lets us correlate deltas to their snapshots during streaming
-            chunk_snapshot = next(
-                (
-                    c
-                    for c in self.message_snapshot.get("tool_call_chunks", [])
-                    if c.get("index", -1) == call_delta.get("index", -2)
-                ),
-                None,
-            )
+        deltas: list[AgentToolCallDelta] = []
+        call_deltas = self.message_delta.get("tool_call_chunks", [])
+        if not call_deltas:
+            return deltas
+
+        # The maps are built in reverse so that, as with a linear search, the
+        # first entry with a given key wins
+        tools_by_name = {t.name: t for t in reversed(tools)}
+        # Streaming chunks come in sequence (0,1,2...) and this index lets us
+        # correlate deltas to their snapshots during streaming. Chunks without
+        # an index are keyed by a sentinel that no delta's default matches.
+        chunk_snapshots_by_index = {
+            c.get("index", -1): c
+            for c in reversed(self.message_snapshot.get("tool_call_chunks", []))
+        }
+        # The full tool calls contain properly parsed arguments (as Python dicts)
+        # while chunks just contain raw JSON strings
+        call_snapshots_by_id = {
+            c.get("id"): c for c in reversed(self.message_snapshot["tool_calls"])
+        }
+
+        for call_delta in call_deltas:
+            # First match chunks by index
+            chunk_snapshot = chunk_snapshots_by_index.get(call_delta.get("index", -2))
 
             if chunk_snapshot and chunk_snapshot.get("id"):
                 # Once we have the matching chunk, use its ID to find the full tool call
-                # The full tool calls contain properly parsed arguments (as Python dicts)
-                # while chunks just contain raw JSON strings
-                call_snapshot = next(
-                    (
-                        c
-                        for c in self.message_snapshot["tool_calls"]
-                        if c.get("id") == chunk_snapshot["id"]
-                    ),
-                    None,
-                )
+                call_snapshot = call_snapshots_by_id.get(chunk_snapshot["id"])
 
                 if call_snapshot:
-                    tool = next(
-                        (t for t in tools if t.name == call_snapshot.get("name")), None
-                    )
+                    tool = tools_by_name.get(call_snapshot.get("name"))
                     # Use call_snapshot.args which is already parsed into a Python dict
                     # This avoids issues with pydantic's more limited JSON parser
                     deltas.append(
-                        AgentToolCallDelta(
+                        AgentToolCallDelta._fast(
                             agent=self.agent,
                             tool_call_delta=call_delta,
                             tool_call_snapshot=call_snapshot,
@@ -182,7 +278,7 @@ class AgentMessageDelta(UnpersistedEvent):
 
     def to_content_delta(self) -> Optional["AgentContentDelta"]:
         if self.message_delta.get("content"):
-            return AgentContentDelta(
+            return AgentContentDelta._fast(
                 agent=self.agent,
                 content_delta=self.message_delta["content"],
                 content_snapshot=self.message_snapshot["content"],
@@ -190,12 +286,11 @@ class AgentMessageDelta(UnpersistedEvent):
             )
 
     def all_related_events(self, tools: list[Tool]) -> list[Event]:
-        content_delta = self.to_content_delta()
-        return (
-            [self]
-            + ([content_delta] if content_delta else [])
-            + self.to_tool_call_deltas(tools)
-        )
+        events: list[Event] = [self]
+        if content_delta := self.to_content_delta():
+            events.append(content_delta)
+        events.extend(self.to_tool_call_deltas(tools))
+        return events
 
 
 class AgentContent(UnpersistedEvent):
@@ -1,19 +1,26 @@
 import abc
-import json
-import math
+import os
+import tempfile
 from functools import cache
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Generator, Iterable, Optional, TypeVar, Union
 
-from pydantic import Field, TypeAdapter, field_validator
+import pydantic_core
+from pydantic import Field, PrivateAttr, TypeAdapter, field_validator
 
 import controlflow
 from controlflow.events.base import Event
 from controlflow.utilities.general import ControlFlowModel
+from controlflow.utilities.logging import get_logger
+
+logger = get_logger(__name__)
 
 # This is a global variable that will be shared between all instances of InMemoryStore
 IN_MEMORY_STORE = {}
 
+T = TypeVar("T")
+
 
 @cache
 def get_event_validator() -> TypeAdapter:
@@ -36,35 +43,63 @@ def get_event_validator() -> TypeAdapter:
     return TypeAdapter(list[types])
 
 
-def filter_events(
-    events: list[Event],
+def read_lines_reversed(
+    path: Path, chunk_size: int = 64 * 1024
+) -> Generator[bytes, None, None]:
+    """
+    Yields the non-empty lines of a file from last to first, reading the file
+    backwards in chunks so that only as much of it is read as is consumed.
+
+    A trailing line that isn't terminated by a newline is skipped, since it may
+    be an append that is still being written.
+    """
+    with path.open("rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        skip_last_line = True
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # the first line may continue in the previous chunk
+            remainder = lines.pop(0)
+            # everything after the last newline is either empty or incomplete
+            if skip_last_line and lines:
+                lines.pop()
+                skip_last_line = False
+            yield from (line for line in reversed(lines) if line)
+        if remainder and not skip_last_line:
+            yield remainder
+
+
+def _filter_reversed(
+    reversed_events: Iterable[T],
+    get_id: Callable[[T], str],
+    get_type: Callable[[T], str],
     types: Optional[list[str]] = None,
     before_id: Optional[str] = None,
     after_id: Optional[str] = None,
     limit: Optional[int] = None,
-):
+) -> list[T]:
     """
-    Filters a list of events based on the specified criteria.
-
-    Args:
-        events (list[Event]): The list of events to filter.
-        tags: (Optional[list[str]]): The tags to filter by. Defaults to None.
-        types (Optional[list[str]]): The event types to filter by. Defaults to None.
-        before_id (Optional[str]): The ID of the event before which to start including events. Defaults to None.
-        after_id (Optional[str]): The ID of the event after which to stop including events. Defaults to None.
-        limit (Optional[int]): The maximum number of events to include. Defaults to None.
-
-    Returns:
-        list[Event]: The filtered list of events.
+    Selects events from an iterable of events in reverse chronological order,
+    consuming only as much of it as necessary. Returns the selected events in
+    chronological order.
     """
     new_events = []
     seen_before_id = True if not before_id else False
-    seen_after_id = False if not after_id else True
+    seen_after_id = False
 
-    for event in reversed(events):
-        if event.id == before_id:
+    for event in reversed_events:
+        # once we have enough events we can stop searching
+        if limit is not None and len(new_events) >= limit:
+            break
+
+        event_id = get_id(event)
+        if event_id == before_id:
             seen_before_id = True
-        if event.id == after_id:
+        if event_id == after_id:
             seen_after_id = True
 
         # if we haven't reached the `before_id` we can skip this event
@@ -76,17 +111,46 @@ def filter_events(
             break
 
         # if types are specified and this event is not one of them, skip it
-        if types and event.event not in types:
+        if types and get_type(event) not in types:
             continue
 
         new_events.append(event)
 
-        if len(new_events) >= (limit or math.inf):
-            break
-
     return list(reversed(new_events))
 
 
+def filter_events(
+    events: list[Event],
+    types: Optional[list[str]] = None,
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """
+    Filters a list of events based on the specified criteria.
+
+    Args:
+        events (list[Event]): The list of events to filter.
+        tags: (Optional[list[str]]): The tags to filter by. Defaults to None.
+        types (Optional[list[str]]): The event types to filter by. Defaults to None.
+        before_id (Optional[str]): The ID of the event before which to start including events. Defaults to None.
+        after_id (Optional[str]): The ID of the event after which to stop including events. Defaults to None.
+        limit (Optional[int]): The maximum number of events to include. Defaults to None.
+
+    Returns:
+        list[Event]: The filtered list of events.
+    """
+    return _filter_reversed(
+        reversed(events),
+        get_id=attrgetter("id"),
+        get_type=attrgetter("event"),
+        types=types,
+        before_id=before_id,
+        after_id=after_id,
+        limit=limit,
+    )
+
+
 class History(ControlFlowModel, abc.ABC):
     @abc.abstractmethod
     def get_events(
@@ -108,6 +172,48 @@ class InMemoryHistory(History):
     history: dict[str, list[Event]] = Field(
         default_factory=lambda: IN_MEMORY_STORE, repr=False
     )
+    # per-thread index of event id -> position, keyed alongside the indexed list
+    # and the number of events indexed so far
+    _positions: dict[str, tuple[list[Event], int, dict[str, int]]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    def _get_positions(
+        self, thread_id: str, events: list[Event], rebuild: bool = False
+    ) -> dict[str, int]:
+        """
+        Returns a mapping of event id to position for the thread's events.
+
+        The store may be shared with other histories, so rather than updating
+        the index on write, it is caught up with any appended events on read
+        and rebuilt if the thread's list was replaced or shortened.
+        """
+        indexed_events, n_indexed, positions = self._positions.get(
+            thread_id, (None, 0, {})
+        )
+        if rebuild or indexed_events is not events or n_indexed > len(events):
+            n_indexed, positions = 0, {}
+        for i in range(n_indexed, len(events)):
+            positions[events[i].id] = i
+        self._positions[thread_id] = (events, len(events), positions)
+        return positions
+
+    def _find_position(
+        self, thread_id: str, events: list[Event], event_id: str
+    ) -> Optional[int]:
+        """
+        Returns the position of an event in the thread's events, if present.
+
+        The thread's list can also be modified in place (e.g. cleared and
+        refilled), which the index can't detect. A cached position is therefore
+        only trusted if the event at that position has the requested id;
+        otherwise, or if the id isn't indexed, the index is rebuilt before giving
+        an answer.
+        """
+        position = self._get_positions(thread_id, events).get(event_id)
+        if position is not None and events[position].id == event_id:
+            return position
+        return self._get_positions(thread_id, events, rebuild=True).get(event_id)
 
     def add_events(self, thread_id: str, events: list[Event]):
         self.history.setdefault(thread_id, []).extend(events)
@@ -136,22 +242,90 @@ class InMemoryHistory(History):
 
         """
         events = self.history.get(thread_id, [])
-        return filter_events(
-            events=events,
-            types=types,
-            before_id=before_id,
-            after_id=after_id,
-            limit=limit,
-        )
+
+        # locate the slice bounds by id instead of scanning every event
+        start, end = 0, len(events)
+        if before_id:
+            before_position = self._find_position(thread_id, events, before_id)
+            if before_position is None:
+                return []
+            end = before_position + 1
+        if after_id:
+            after_position = self._find_position(thread_id, events, after_id)
+            if after_position is not None:
+                start = after_position + 1
+
+        # without a type filter, the selection is just the tail of the slice
+        if not types:
+            if limit is not None:
+                start = max(start, end - limit)
+            return events[start:end]
+
+        return filter_events(events=events[start:end], types=types, limit=limit)
 
 
 class FileHistory(History):
+    """
+    Stores each thread's events as a JSON-lines file, so that adding events only
+    appends to the file and recent events can be read from the end of the file
+    without reading all of it.
+    """
+
     base_path: Path = Field(
         default_factory=lambda: controlflow.settings.home_path / "history/FileHistory"
     )
 
     def path(self, thread_id: str) -> Path:
-        return self.base_path / f"{thread_id}.json"
+        return self.base_path / f"{thread_id}.jsonl"
+
+    def _migrate_json_file(self, thread_id: str):
+        """
+        Threads used to be stored as a single JSON list; convert any such file to
+        JSON lines. The converted file is written to a temporary path and linked
+        into place only if no other process has created it in the meantime, so
+        that readers never see a partially written file and events appended
+        after another process's migration are never overwritten.
+
+        A legacy file that can't be decoded is left in place and ignored, as it
+        was by the old implementation.
+        """
+        legacy_path = self.base_path / f"{thread_id}.json"
+        try:
+            events = pydantic_core.from_json(legacy_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except ValueError:
+            events = None
+        if not isinstance(events, list):
+            logger.warning(f"Ignoring undecodable history file {legacy_path}")
+            return
+
+        with tempfile.NamedTemporaryFile(
+            dir=self.base_path, suffix=".jsonl.tmp", delete=False
+        ) as f:
+            f.write(b"".join(pydantic_core.to_json(event) + b"\n" for event in events))
+        try:
+            os.link(f.name, self.path(thread_id))
+        except FileExistsError:
+            # another process migrated the file first
+            pass
+        else:
+            legacy_path.unlink(missing_ok=True)
+        finally:
+            os.unlink(f.name)
+
+    def _parse_lines(
+        self, file_path: Path, lines: Iterable[bytes]
+    ) -> Generator[dict, None, None]:
+        """
+        Parses JSON lines, skipping any that were corrupted by an interrupted
+        append.
+        """
+        for line in lines:
+            try:
+                yield pydantic_core.from_json(line)
+            except ValueError:
+                logger.warning(f"Skipping undecodable event in {file_path}")
 
     def get_events(
         self,
@@ -177,39 +351,37 @@ class FileHistory(History):
         file_path = self.path(thread_id)
 
         if not file_path.exists():
-            return []
-
-        with file_path.open("r") as f:
-            raw_data = f.read()
-
-        validator = get_event_validator()
-        events = validator.validate_json(raw_data)
-
-        return filter_events(
-            events=events,
+            self._migrate_json_file(thread_id)
+            if not file_path.exists():
+                return []
+
+        # read the file from the end, parsing lines only until the selection is
+        # complete and validating only the selected events
+        raw_events = _filter_reversed(
+            self._parse_lines(file_path, read_lines_reversed(file_path)),
+            get_id=itemgetter("id"),
+            get_type=itemgetter("event"),
             types=types,
             before_id=before_id,
             after_id=after_id,
             limit=limit,
         )
+        return get_event_validator().validate_python(raw_events)
 
     def add_events(self, thread_id: str, events: list[Event]):
-        # TODO: this is pretty inefficient because we read / write the entire file
-        # every time instead of doing it incrementally. Need to switch to JSONL
-        # if we want to improve performance.
+        self.base_path.mkdir(parents=True, exist_ok=True)
         file_path = self.path(thread_id)
-
         if not file_path.exists():
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.touch()
-
-        with file_path.open("r") as f:
-            try:
-                all_events = json.load(f)
-            except json.JSONDecodeError:
-                all_events = []
-
-        all_events.extend([event.model_dump(mode="json") for event in events])
-
-        with file_path.open("w") as f:
-            json.dump(all_events, f)
+            self._migrate_json_file(thread_id)
+
+        data = b"".join(event.model_dump_json().encode() + b"\n" for event in events)
+        with file_path.open("a+b") as f:
+            # terminate a line left unfinished by an interrupted append, so that
+            # the first new event doesn't run into it
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            # write all events in a single call so concurrent appends don't
+            # interleave
+            f.write(data)
@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from functools import cache
 from typing import TYPE_CHECKING, Literal, Optional
 
 import tiktoken
@@ -150,11 +151,15 @@ def format_message_name(
     return messages
 
 
+@cache
+def get_token_encoding() -> tiktoken.Encoding:
+    # always use gpt-3.5 token counter; we only need to be approximate here
+    return tiktoken.encoding_for_model("gpt-3.5-turbo")
+
+
 def count_tokens(message: BaseMessage) -> int:
-    # always use gpt-3.5 token counter with the entire message object; we only need to be approximate here
-    return len(
-        tiktoken.encoding_for_model("gpt-3.5-turbo").encode(message.model_dump_json())
-    )
+    # count tokens for the entire message object
+    return len(get_token_encoding().encode(message.model_dump_json()))
 
 
 def trim_messages(
@@ -171,10 +176,11 @@ def trim_messages(
     budget = max_tokens
 
     for message in reversed(messages):
-        if count_tokens(message) > budget:
+        tokens = count_tokens(message)
+        if tokens > budget:
             break
         new_messages.append(message)
-        budget -= count_tokens(message)
+        budget -= tokens
 
     return list(reversed(new_messages))
 
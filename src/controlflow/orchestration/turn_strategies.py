@@ -2,6 +2,8 @@ import random
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
+from pydantic import PrivateAttr
+
 from controlflow.agents import Agent
 from controlflow.tasks.task import Task
 from controlflow.tools.tools import Tool, tool
@@ -12,6 +14,11 @@ class TurnStrategy(ControlFlowModel, ABC):
     end_turn: bool = False
     next_agent: Optional[Agent] = None
 
+    # generating a tool introspects its signature, so the tools are reused
+    # across turns; the delegate tool is rebuilt when the available agents change
+    _end_turn_tool: Optional[Tool] = PrivateAttr(None)
+    _delegate_tool: Optional[tuple[frozenset[Agent], Tool]] = PrivateAttr(None)
+
     @abstractmethod
     def get_tools(
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
@@ -37,6 +44,17 @@ class TurnStrategy(ControlFlowModel, ABC):
         """
         return self.end_turn
 
+    def _get_end_turn_tool(self) -> Tool:
+        if self._end_turn_tool is None:
+            self._end_turn_tool = get_end_turn_tool(self)
+        return self._end_turn_tool
+
+    def _get_delegate_tool(self, available_agents: dict[Agent, list[Task]]) -> Tool:
+        agents = frozenset(available_agents)
+        if self._delegate_tool is None or self._delegate_tool[0] != agents:
+            self._delegate_tool = (agents, get_delegate_tool(self, available_agents))
+        return self._delegate_tool[1]
+
 
 def get_end_turn_tool(strategy: TurnStrategy) -> Tool:
     @tool
@@ -54,14 +72,17 @@ def get_end_turn_tool(strategy: TurnStrategy) -> Tool:
 def get_delegate_tool(
     strategy: TurnStrategy, available_agents: dict[Agent, list[Task]]
 ) -> Tool:
+    # agents can share an ID, in which case the first one is used
+    agents_by_id = {}
+    for agent in available_agents:
+        agents_by_id.setdefault(agent.id, agent)
+
     @tool
     def delegate_to_agent(agent_id: str, message: str = None) -> str:
         """Delegate to another agent and optionally send a message."""
         if len(available_agents) <= 1:
             return "Cannot delegate as there are no other available agents."
-        next_agent = next(
-            (a for a in available_agents.keys() if a.id == agent_id), None
-        )
+        next_agent = agents_by_id.get(agent_id)
         if next_agent is None:
             raise ValueError(f"Agent with ID {agent_id} not found or not available.")
         strategy.end_turn = True
@@ -77,7 +98,7 @@ class SingleAgent(TurnStrategy):
     def get_tools(
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
     ) -> list[Tool]:
-        return [get_end_turn_tool(self)]
+        return [self._get_end_turn_tool()]
 
     def get_next_agent(
         self, current_agent: Optional[Agent], available_agents: Dict[Agent, List[Task]]
@@ -93,7 +114,7 @@ class Popcorn(TurnStrategy):
     def get_tools(
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
     ) -> list[Tool]:
-        return [get_delegate_tool(self, available_agents)]
+        return [self._get_delegate_tool(available_agents)]
 
     def get_next_agent(
         self, current_agent: Optional[Agent], available_agents: Dict[Agent, List[Task]]
@@ -107,19 +128,19 @@ class Random(TurnStrategy):
     def get_tools(
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
     ) -> list[Tool]:
-        return [get_end_turn_tool(self)]
+        return [self._get_end_turn_tool()]
 
     def get_next_agent(
         self, current_agent: Optional[Agent], available_agents: Dict[Agent, List[Task]]
     ) -> Agent:
-        return random.choice(list(available_agents.keys()))
+        return random.choice(list(available_agents))
 
 
 class RoundRobin(TurnStrategy):
     def get_tools(
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
     ) -> list[Tool]:
-        return [get_end_turn_tool(self)]
+        return [self._get_end_turn_tool()]
 
     def get_next_agent(
         self, current_agent: Optional[Agent], available_agents: Dict[Agent, List[Task]]
@@ -132,17 +153,21 @@ class RoundRobin(TurnStrategy):
         return agents[next_index]
 
 
+def _count_tasks(item: tuple[Agent, list[Task]]) -> int:
+    return len(item[1])
+
+
 class MostBusy(TurnStrategy):
     def get_tools(
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
     ) -> list[Tool]:
-        return [get_end_turn_tool(self)]
+        return [self._get_end_turn_tool()]
 
     def get_next_agent(
         self, current_agent: Optional[Agent], available_agents: Dict[Agent, List[Task]]
     ) -> Agent:
         # Select the agent with the most tasks
-        return max(available_agents, key=lambda agent: len(available_agents[agent]))
+        return max(available_agents.items(), key=_count_tasks)[0]
 
 
 class Moderated(TurnStrategy):
@@ -152,9 +177,9 @@ class Moderated(TurnStrategy):
         self, current_agent: Agent, available_agents: dict[Agent, list[Task]]
     ) -> list[Tool]:
         if current_agent == self.moderator:
-            return [get_delegate_tool(self, available_agents)]
+            return [self._get_delegate_tool(available_agents)]
         else:
-            return [get_end_turn_tool(self)]
+            return [self._get_end_turn_tool()]
 
     def get_next_agent(
         self, current_agent: Optional[Agent], available_agents: Dict[Agent, List[Task]]
@@ -0,0 +1,195 @@
+from controlflow.agents import Agent
+from controlflow.events.events import (
+    AgentContent,
+    AgentContentDelta,
+    AgentMessage,
+    AgentMessageDelta,
+    AgentToolCallDelta,
+    OrchestratorMessage,
+)
+from controlflow.llm.messages import AIMessage, AIMessageChunk
+from controlflow.tools import Tool
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def multiply(x: int) -> int:
+    return x * 2
+
+
+def stream_tool_call_deltas(chunks, tools):
+    agent = Agent(name="A")
+    snapshot = None
+    deltas = []
+    for chunk in chunks:
+        snapshot = chunk if snapshot is None else snapshot + chunk
+        event = AgentMessageDelta(
+            agent=agent, message_delta=chunk, message_snapshot=snapshot
+        )
+        deltas.append(event.to_tool_call_deltas(tools))
+    return deltas
+
+
+def assert_same_as_validated(event, expected_cls, **fields):
+    # related events are built without validation; check that they carry the
+    # same defaults and data as events built through the validating constructor
+    assert type(event) is expected_cls
+    assert event.id and event.timestamp
+    assert event.persist is False
+    expected = expected_cls(id=event.id, timestamp=event.timestamp, **fields)
+    assert event.model_dump() == expected.model_dump()
+
+
+class TestAgentMessage:
+    def test_ai_message_refreshed_on_assignment(self):
+        event = AgentMessage(agent=Agent(name="A"), message=AIMessage(content="hi"))
+        assert event.ai_message.content == "hi"
+        assert event.cross_agent_content.endswith("hi")
+
+        event.message = AIMessage(content="bye")
+        assert event.ai_message.content == "bye"
+        assert event.cross_agent_content.endswith("bye")
+
+    def test_model_copy_does_not_reuse_cached_values(self):
+        event = AgentMessage(agent=Agent(name="A"), message=AIMessage(content="hi"))
+        assert event.ai_message.content == "hi"
+        assert event.cross_agent_content.endswith("hi")
+
+        copy = event.model_copy(update={"message": {**event.message, "content": "bye"}})
+        assert copy.ai_message.content == "bye"
+        assert copy.cross_agent_content.endswith("bye")
+        assert event.ai_message.content == "hi"
+
+    def test_related_content_matches_validated_event(self):
+        agent = Agent(name="A")
+        event = AgentMessage(agent=agent, message=AIMessage(content="hi", id="m1"))
+
+        [_, content] = event.all_related_events(tools=[])
+        assert_same_as_validated(
+            content, AgentContent, agent=agent, content="hi", agent_message_id="m1"
+        )
+        assert content.id != event.to_content().id
+
+
+class TestOrchestratorMessage:
+    def test_model_copy_does_not_reuse_formatted_content(self):
+        event = OrchestratorMessage(content="hi")
+        assert event.formatted_content.endswith("hi")
+
+        copy = event.model_copy(update={"content": "bye"})
+        assert copy.formatted_content.endswith("bye")
+        assert event.formatted_content.endswith("hi")
+
+
+class TestAgentMessageDelta:
+    def test_messages_converted_to_dicts(self):
+        agent = Agent(name="A")
+        delta = AIMessageChunk(content="lo")
+        snapshot = AIMessageChunk(content="hello")
+        event = AgentMessageDelta(
+            agent=agent, message_delta=delta, message_snapshot=snapshot
+        )
+
+        assert event.message_delta["content"] == "lo"
+        assert event.message_snapshot["content"] == "hello"
+        for message in (event.message_delta, event.message_snapshot):
+            assert message["type"] == "AIMessageChunk"
+            assert message["name"] == "A"
+
+        # the streamed chunks are not modified
+        assert delta.name is None
+        assert snapshot.name is None
+
+    def test_identical_deltas_are_equal(self):
+        agent = Agent(name="A")
+        delta = AIMessageChunk(content="lo")
+        e1 = AgentMessageDelta(agent=agent, message_delta=delta, message_snapshot=delta)
+        e2 = AgentMessageDelta(
+            agent=agent,
+            message_delta=delta,
+            message_snapshot=delta,
+            id=e1.id,
+            timestamp=e1.timestamp,
+        )
+        assert e1 == e2
+
+    def test_round_trip(self):
+        agent = Agent(name="A")
+        delta = AIMessageChunk(content="lo")
+        event = AgentMessageDelta(
+            agent=agent, message_delta=delta, message_snapshot=delta
+        )
+        assert AgentMessageDelta.model_validate(event.model_dump()) == event
+
+    def test_tool_call_deltas_matched_to_snapshots(self):
+        tools = [Tool.from_function(add), Tool.from_function(multiply)]
+        chunks = [
+            AIMessageChunk(
+                content="",
+                tool_call_chunks=[dict(name="add", args='{"a": 1', id="c1", index=0)],
+            ),
+            AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    dict(name=None, args=', "b": 2}', id=None, index=0),
+                    dict(name="multiply", args='{"x": 3}', id="c2", index=1),
+                ],
+            ),
+        ]
+
+        deltas = stream_tool_call_deltas(chunks, tools)
+
+        assert [len(d) for d in deltas] == [1, 2]
+        first, (second, third) = deltas[0][0], deltas[1]
+        assert first.tool is tools[0]
+        assert first.args == {"a": 1}
+        assert first.tool_call_delta["args"] == '{"a": 1'
+        assert second.tool is tools[0]
+        assert second.args == {"a": 1, "b": 2}
+        assert second.tool_call_snapshot["id"] == "c1"
+        assert second.tool_call_delta["args"] == ', "b": 2}'
+        assert third.tool is tools[1]
+        assert third.args == {"x": 3}
+        assert third.tool_call_snapshot["id"] == "c2"
+
+    def test_tool_call_deltas_use_first_tool_with_name(self):
+        tools = [Tool.from_function(add), Tool.from_function(add)]
+        chunk = AIMessageChunk(
+            content="",
+            tool_call_chunks=[dict(name="add", args="{}", id="c1", index=0)],
+        )
+
+        [[delta]] = stream_tool_call_deltas([chunk], tools)
+        assert delta.tool is tools[0]
+
+    def test_related_deltas_match_validated_events(self):
+        agent = Agent(name="A")
+        tool = Tool.from_function(add)
+        call_chunk = dict(name="add", args='{"a": 1}', id="c1", index=0)
+        delta = AIMessageChunk(content="lo", id="m1", tool_call_chunks=[call_chunk])
+        snapshot = AIMessageChunk(content="hel", id="m1") + delta
+        event = AgentMessageDelta(
+            agent=agent, message_delta=delta, message_snapshot=snapshot
+        )
+
+        [_, content_delta, tool_call_delta] = event.all_related_events(tools=[tool])
+        assert_same_as_validated(
+            content_delta,
+            AgentContentDelta,
+            agent=agent,
+            content_delta="lo",
+            content_snapshot="hello",
+            agent_message_id="m1",
+        )
+        assert_same_as_validated(
+            tool_call_delta,
+            AgentToolCallDelta,
+            agent=agent,
+            tool_call_delta=event.message_delta["tool_call_chunks"][0],
+            tool_call_snapshot=event.message_snapshot["tool_calls"][0],
+            tool=tool,
+            args={"a": 1},
+            agent_message_id="m1",
+        )
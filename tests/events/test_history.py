@@ -1,25 +1,80 @@
+import json
 import threading
 
 import pytest
 
 from controlflow.events.events import UserMessage
-from controlflow.events.history import FileHistory
+from controlflow.events.history import (
+    FileHistory,
+    InMemoryHistory,
+    read_lines_reversed,
+)
 from controlflow.flows import Flow
 
 
+class TestInMemoryHistory:
+    def test_before_and_after_id(self):
+        h = InMemoryHistory(history={})
+        events = [UserMessage(content=str(i)) for i in range(5)]
+        h.add_events("abc", events)
+
+        assert h.get_events("abc", before_id=events[2].id) == events[:3]
+        assert h.get_events("abc", after_id=events[2].id) == events[3:]
+        assert (
+            h.get_events("abc", after_id=events[0].id, before_id=events[3].id)
+            == events[1:4]
+        )
+        assert h.get_events("abc", before_id="missing") == []
+
+    def test_limit(self):
+        h = InMemoryHistory(history={})
+        events = [UserMessage(content=str(i)) for i in range(5)]
+        h.add_events("abc", events)
+        assert h.get_events("abc", limit=2) == events[-2:]
+
+    def test_sees_events_added_to_store_directly(self):
+        h = InMemoryHistory(history={})
+        events = [UserMessage(content=str(i)) for i in range(4)]
+
+        h.add_events("abc", events[:2])
+        assert h.get_events("abc", before_id=events[1].id) == events[:2]
+        h.history["abc"].extend(events[2:])
+        assert h.get_events("abc", after_id=events[1].id) == events[2:]
+        h.history["abc"] = events[2:]
+        assert h.get_events("abc", before_id=events[1].id) == []
+
+    def test_sees_store_modified_in_place(self):
+        h = InMemoryHistory(history={})
+        a = [UserMessage(content=f"a{i}") for i in range(4)]
+        b = [UserMessage(content=f"b{i}") for i in range(4)]
+
+        h.add_events("abc", a)
+        assert h.get_events("abc", before_id=a[1].id) == a[:2]
+
+        h.history["abc"].clear()
+        h.history["abc"].extend(b)
+        assert h.get_events("abc", before_id=b[1].id) == b[:2]
+        assert h.get_events("abc", after_id=b[1].id) == b[2:]
+        assert h.get_events("abc", before_id=a[1].id) == []
+
+        h.history["abc"][0] = a[0]
+        assert h.get_events("abc", before_id=a[0].id) == [a[0]]
+        assert h.get_events("abc", before_id=b[0].id) == []
+
+
 class TestFileHistory:
     def test_write_to_thread_id_file(self, tmp_path):
         h = FileHistory(base_path=tmp_path)
         event = UserMessage(content="test")
         thread_id = "abc"
 
-        # assert a file called 'abc.json' does not exist in tmp_path
-        assert not (tmp_path / f"{thread_id}.json").exists()
+        # assert a file called 'abc.jsonl' does not exist in tmp_path
+        assert not (tmp_path / f"{thread_id}.jsonl").exists()
 
         h.add_events(thread_id, [event])
 
-        # assert a file called 'abc.json' exists in tmp_path
-        assert (tmp_path / f"{thread_id}.json").exists()
+        # assert a file called 'abc.jsonl' exists in tmp_path
+        assert (tmp_path / f"{thread_id}.jsonl").exists()
 
     def test_read_from_thread_id_file(self, tmp_path):
         h1 = FileHistory(base_path=tmp_path)
@@ -48,7 +103,7 @@ class TestFileHistory:
         thread_id = "abc"
 
         h.add_events(thread_id, [event])
-        assert (tmp_path / "subdir" / f"{thread_id}.json").exists()
+        assert (tmp_path / "subdir" / f"{thread_id}.jsonl").exists()
 
     def test_empty_event_content(self, tmp_path):
         """Test adding an event with empty content"""
@@ -58,6 +113,86 @@ class TestFileHistory:
         h.add_events(thread_id, [event])
         assert h.get_events(thread_id) == [event]
 
+    def test_filter_events(self, tmp_path):
+        h = FileHistory(base_path=tmp_path)
+        events = [UserMessage(content=str(i)) for i in range(5)]
+        thread_id = "abc"
+        h.add_events(thread_id, events)
+
+        assert h.get_events(thread_id, limit=2) == events[-2:]
+        assert h.get_events(thread_id, limit=0) == []
+        assert h.get_events(thread_id, before_id=events[2].id) == events[:3]
+        assert h.get_events(thread_id, after_id=events[2].id) == events[3:]
+        assert h.get_events(thread_id, types=["agent-message"]) == []
+
+    def test_add_events_appends(self, tmp_path):
+        h = FileHistory(base_path=tmp_path)
+        events = [UserMessage(content=str(i)) for i in range(3)]
+        thread_id = "abc"
+        for event in events:
+            h.add_events(thread_id, [event])
+
+        assert len((tmp_path / f"{thread_id}.jsonl").read_bytes().splitlines()) == 3
+        assert h.get_events(thread_id) == events
+
+    def test_migrate_json_file(self, tmp_path):
+        h = FileHistory(base_path=tmp_path)
+        events = [UserMessage(content=str(i)) for i in range(3)]
+        thread_id = "abc"
+        (tmp_path / f"{thread_id}.json").write_text(
+            json.dumps([e.model_dump(mode="json") for e in events])
+        )
+
+        assert h.get_events(thread_id) == events
+        assert not (tmp_path / f"{thread_id}.json").exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_skips_partially_written_event(self, tmp_path):
+        h = FileHistory(base_path=tmp_path)
+        events = [UserMessage(content=str(i)) for i in range(2)]
+        h.add_events("abc", events)
+        with h.path("abc").open("ab") as f:
+            f.write(UserMessage(content="2").model_dump_json().encode()[:10])
+
+        assert h.get_events("abc") == events
+
+    def test_append_after_partially_written_event(self, tmp_path):
+        h = FileHistory(base_path=tmp_path)
+        events = [UserMessage(content=str(i)) for i in range(3)]
+        h.add_events("abc", events[:1])
+        with h.path("abc").open("ab") as f:
+            f.write(b'{"id": "trunc')
+        h.add_events("abc", events[1:])
+
+        assert h.get_events("abc", limit=1) == events[2:]
+        assert h.get_events("abc", after_id=events[0].id) == events[1:]
+
+    @pytest.mark.parametrize("content", ["", "not json", "{}"])
+    def test_invalid_json_file_is_ignored(self, tmp_path, content):
+        h = FileHistory(base_path=tmp_path)
+        event = UserMessage(content="test")
+        (tmp_path / "abc.json").write_text(content)
+
+        assert h.get_events("abc") == []
+        h.add_events("abc", [event])
+        assert h.get_events("abc") == [event]
+
+    def test_migrate_json_file_does_not_overwrite_existing_file(self, tmp_path):
+        h = FileHistory(base_path=tmp_path)
+        legacy_event, event = UserMessage(content="old"), UserMessage(content="new")
+        (tmp_path / "abc.json").write_text(
+            json.dumps([legacy_event.model_dump(mode="json")])
+        )
+        # another process migrates and appends between this process's check for
+        # the new file and its migration
+        h.path("abc").write_text(
+            legacy_event.model_dump_json() + "\n" + event.model_dump_json() + "\n"
+        )
+        h._migrate_json_file("abc")
+
+        assert h.get_events("abc") == [legacy_event, event]
+        assert not list(tmp_path.glob("*.tmp"))
+
     def test_no_events_added(self, tmp_path):
         """Test no events are added and reading from an empty thread"""
         h = FileHistory(base_path=tmp_path)
@@ -73,6 +208,23 @@ class TestFileHistory:
             h.add_events(thread_id, [event])
 
 
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_read_lines_reversed(tmp_path, chunk_size):
+    path = tmp_path / "lines.jsonl"
+    path.write_bytes(b"one\ntwo\n\nthree\n")
+    lines = list(read_lines_reversed(path, chunk_size=chunk_size))
+    assert lines == [b"three", b"two", b"one"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_read_lines_reversed_skips_unterminated_line(tmp_path, chunk_size):
+    path = tmp_path / "lines.jsonl"
+    path.write_bytes(b"one\ntwo\nthr")
+    assert list(read_lines_reversed(path, chunk_size=chunk_size)) == [b"two", b"one"]
+    path.write_bytes(b"one")
+    assert list(read_lines_reversed(path, chunk_size=chunk_size)) == []
+
+
 class TestFileHistoryFlow:
     def test_flow_uses_file_history(self, tmp_path):
         f1 = Flow(thread_id="abc", history=FileHistory(base_path=tmp_path))
@@ -0,0 +1,42 @@
+from controlflow.agents import Agent
+from controlflow.events.events import AgentMessage, UserMessage
+from controlflow.events.message_compiler import MessageCompiler
+from controlflow.llm.messages import AIMessage, HumanMessage
+from controlflow.llm.rules import OpenAIRules
+
+
+class TestCompileEvents:
+    def test_compile_user_message(self):
+        agent = Agent(name="A")
+        compiler = MessageCompiler(
+            events=[UserMessage(content="hello")], llm_rules=OpenAIRules(model=None)
+        )
+        messages = compiler.compile_to_messages(agent=agent)
+        assert messages == [HumanMessage(content="hello")]
+
+    def test_compile_events_by_agent(self):
+        agent_a = Agent(name="A")
+        agent_b = Agent(name="B")
+        event = AgentMessage(agent=agent_a, message=AIMessage(content="hi"))
+        compiler = MessageCompiler(events=[event], llm_rules=OpenAIRules(model=None))
+
+        own_message = compiler.compile_to_messages(agent=agent_a)[-1]
+        assert isinstance(own_message, AIMessage)
+        assert own_message.content == "hi"
+
+        other_message = compiler.compile_to_messages(agent=agent_b)[-1]
+        assert isinstance(other_message, HumanMessage)
+        assert other_message.content.endswith("hi")
+        assert other_message.name == "A"
+
+    def test_compiling_does_not_modify_events(self):
+        agent = Agent(name="Marvin the Robot")
+        event = AgentMessage(agent=agent, message=AIMessage(content="hi"))
+        compiler = MessageCompiler(events=[event], llm_rules=OpenAIRules(model=None))
+
+        for _ in range(2):
+            messages = compiler.compile_to_messages(agent=agent)
+            assert messages[-1].name == "Marvin-the-Robot"
+
+        assert event.ai_message.name == "Marvin the Robot"
+        assert event.message["name"] == "Marvin the Robot"
@@ -88,6 +88,15 @@ def test_round_robin_strategy(agents, available_agents):
     assert next_agent == agents[0]
 
 
+def test_round_robin_strategy_agents_change(agents, available_agents):
+    strategy = RoundRobin()
+    assert strategy.get_next_agent(agents[0], available_agents) == agents[1]
+
+    remaining_agents = {agents[0]: [], agents[2]: []}
+    assert strategy.get_next_agent(agents[0], remaining_agents) == agents[2]
+    assert strategy.get_next_agent(agents[1], remaining_agents) == agents[0]
+
+
 def test_most_busy_strategy(agents, available_agents):
     strategy = MostBusy()
     current_agent = agents[0]
@@ -121,3 +130,21 @@ def test_moderated_strategy(agents, available_agents):
 
     next_agent = strategy.get_next_agent(agents[1], available_agents)
     assert next_agent == moderator
+
+
+def test_tools_are_reused_across_turns(agents, available_agents):
+    strategy = Popcorn()
+    tools = strategy.get_tools(agents[0], available_agents)
+    assert strategy.get_tools(agents[1], dict(available_agents))[0] is tools[0]
+
+    # the delegate tool is rebuilt when the available agents change
+    fewer_agents = {agents[0]: available_agents[agents[0]]}
+    new_tools = strategy.get_tools(agents[0], fewer_agents)
+    assert new_tools[0] is not tools[0]
+    assert new_tools[0].run(dict(agent_id=agents[1].id)).startswith("Cannot delegate")
+
+    strategy = RoundRobin()
+    end_turn = strategy.get_tools(agents[0], available_agents)[0]
+    assert strategy.get_tools(agents[1], available_agents)[0] is end_turn
+    end_turn.run({})
+    assert strategy.should_end_turn()